@@ -1,7 +1,7 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import List, Optional
-import math
+from typing import List, Optional, Tuple
+import numpy as np
 from api.stations import Station
 
 
@@ -12,19 +12,42 @@ class RouteStep:
     distance_km_from_prev: float = 0.0
 
 
-def _haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    # Earth radius in km
+def _haversine_km_rad(phi1, lam1, phi2, lam2):
+    """
+    Haversine on coordinates already in radians.
+    Works on floats or NumPy arrays (element-wise).
+    """
     R = 6371.0
-    phi1 = math.radians(lat1)
-    phi2 = math.radians(lat2)
-    dphi = math.radians(lat2 - lat1)
-    dlambda = math.radians(lon2 - lon1)
+    dphi = phi2 - phi1
+    dlambda = lam2 - lam1
 
-    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlambda / 2) ** 2
+    c = 2 * np.arcsin(np.sqrt(np.minimum(1.0, a)))
     return R * c
 
 
+def _ordered_legs(
+    departure: Station,
+    arrival: Station,
+    via: Optional[List[Station]],
+) -> Tuple[List[Station], np.ndarray]:
+    """
+    Ordered stations (departure -> via... -> arrival) and the distance of each leg.
+    """
+    ordered = [departure] + (via or []) + [arrival]
+
+    phis = np.array([st.lat_rad for st in ordered], dtype=float)
+    lams = np.array([st.lon_rad for st in ordered], dtype=float)
+    dists = _haversine_km_rad(phis[:-1], lams[:-1], phis[1:], lams[1:])
+    return ordered, dists
+
+
+def _step_label(i: int, n_stations: int) -> str:
+    if i == 0:
+        return "Départ"
+    return "Étape" if i < n_stations - 1 else "Arrivée"
+
+
 def build_itinerary(
     departure: Station,
     arrival: Station,
@@ -37,18 +60,16 @@ def build_itinerary(
 
     This satisfies “sequence of routing points” even before SNCF schedule APIs.
     """
-    via = via or []
-    ordered = [departure] + via + [arrival]
-
-    steps: List[RouteStep] = []
-    prev = None
-    for i, st in enumerate(ordered):
-        if prev is None:
-            steps.append(RouteStep(label="Départ", station=st, distance_km_from_prev=0.0))
-        else:
-            d = _haversine_km(prev.latitude, prev.longitude, st.latitude, st.longitude)
-            label = "Étape" if i < len(ordered) - 1 else "Arrivée"
-            steps.append(RouteStep(label=label, station=st, distance_km_from_prev=float(d)))
-        prev = st
+    ordered, dists = _ordered_legs(departure, arrival, via)
 
+    steps: List[RouteStep] = [RouteStep(label="Départ", station=departure, distance_km_from_prev=0.0)]
+    steps += [
+        RouteStep(
+            label=_step_label(i, len(ordered)),
+            station=st,
+            distance_km_from_prev=float(d),
+        )
+        for i, (st, d) in enumerate(zip(ordered[1:], dists), start=1)
+    ]
     return steps
+
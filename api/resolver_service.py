@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Dict, Any, Tuple, List
 import sys
@@ -15,12 +16,40 @@ if str(SRC_DIR) not in sys.path:
 from api.stations import (
     load_stations,
     station_candidates_for_city,
+    station_candidates_fuzzy,
     station_candidates_from_free_text,
     Station,
+    _normalize,
 )
 
 STATIONS_CSV = PROJECT_ROOT / "data" / "sncf_clean" / "stations_clean.csv"
 
+# Resolvers are imported once; an import failure is kept and reported by resolve_sentence.
+try:
+    from tor.nlp import parse_order
+    _NLP_IMPORT_ERR: Optional[str] = None
+except Exception as e:
+    parse_order = None
+    _NLP_IMPORT_ERR = repr(e)
+
+# spaCy is heavy to import: it is loaded on the first spacy-mode request only.
+_spacy_resolver = None
+_SPACY_IMPORT_ERR: Optional[str] = None
+
+
+def _get_spacy_resolver():
+    """
+    The tor.spacy_resolver module (parse_order_spacy / parse_orders_spacy), or None if it fails to import.
+    """
+    global _spacy_resolver, _SPACY_IMPORT_ERR
+    if _spacy_resolver is None and _SPACY_IMPORT_ERR is None:
+        try:
+            from tor import spacy_resolver
+            _spacy_resolver = spacy_resolver
+        except Exception as e:
+            _SPACY_IMPORT_ERR = repr(e)
+    return _spacy_resolver
+
 
 @dataclass
 class ResolveResult:
@@ -48,6 +77,28 @@ def _get_stations_df() -> pd.DataFrame:
     return _STATIONS_DF
 
 
+@lru_cache(maxsize=2048)
+def _cached_candidates(city_norm: str, limit: int) -> Tuple[Tuple[Station, ...], Tuple[Station, ...]]:
+    """
+    (whole-word candidates, fuzzy fallback candidates) for a normalized city name.
+    The fuzzy fallback only runs when there is no whole-word match (typo, missing accent...).
+    """
+    df = _get_stations_df()
+    cands = station_candidates_for_city(df, city_norm, limit=limit)
+    if cands:
+        return tuple(cands), ()
+    return (), tuple(station_candidates_fuzzy(df, city_norm, limit=limit, substring_hits=cands))
+
+
+def _candidates_for_city(city: str, limit: int = 12) -> Tuple[List[Station], List[Station]]:
+    """
+    _cached_candidates on the shared stations table, memoized by normalized city name
+    (Station is frozen, so cached instances can be shared between results).
+    """
+    exact, fuzzy = _cached_candidates(_normalize(city), limit)
+    return list(exact), list(fuzzy)
+
+
 def _basic_confidence(sentence: str, dep: str, arr: str) -> Tuple[float, Dict[str, Any]]:
     """
     Confidence baseline from literal presence.
@@ -168,104 +219,114 @@ def _apply_ambiguity_and_contamination_penalties(
     return new_conf, ambiguity_penalty, contamination_penalty
 
 
-def resolve_sentence(sentence: str, mode: str = "baseline", helpful: bool = False) -> ResolveResult:
-    s = (sentence or "").strip()
-    if not s:
-        return ResolveResult(ok=False, confidence=0.0, debug={"reason": "empty_input", "mode": mode})
+def _resolved_result(s: str, mode: str, resolver: str, dep: str, arr: str) -> ResolveResult:
+    """
+    Shared tail of every resolver mode: confidence, station candidates and penalties.
+    """
+    conf, conf_dbg = _basic_confidence(s, dep, arr)
+
+    dep_cands, dep_fuzzy = _candidates_for_city(dep)
+    arr_cands, arr_fuzzy = _candidates_for_city(arr)
+
+    # fuzzy look-alikes are suggestions only: penalties are computed on whole-word matches
+    conf, ambiguity_penalty, contamination_penalty = _apply_ambiguity_and_contamination_penalties(
+        conf=conf,
+        dep=dep,
+        arr=arr,
+        dep_cands=dep_cands,
+        arr_cands=arr_cands,
+    )
 
-    stations_df = _get_stations_df()
+    return ResolveResult(
+        ok=True,
+        departure=dep,
+        arrival=arr,
+        confidence=conf,
+        departure_candidates=dep_cands + dep_fuzzy,
+        arrival_candidates=arr_cands + arr_fuzzy,
+        debug={
+            "mode": mode,
+            "resolver": resolver,
+            **conf_dbg,
+            "departure_candidates_count": len(dep_cands) + len(dep_fuzzy),
+            "arrival_candidates_count": len(arr_cands) + len(arr_fuzzy),
+            "departure_fuzzy_candidates_count": len(dep_fuzzy),
+            "arrival_fuzzy_candidates_count": len(arr_fuzzy),
+            "ambiguity_penalty": ambiguity_penalty,
+            "contamination_penalty": contamination_penalty,
+        },
+    )
 
-    if mode == "baseline":
-        try:
-            from tor.nlp import parse_order
-        except Exception as e:
-            return ResolveResult(
-                ok=False,
-                confidence=0.0,
-                debug={"reason": "import_error", "mode": mode, "details": repr(e), "src_dir": str(SRC_DIR)},
-            )
-
-        result = parse_order(s)
-        if result is None:
-            return _invalid_result_baseline(helpful, stations_df, s)
-
-        dep, arr = result
-        conf, conf_dbg = _basic_confidence(s, dep, arr)
-
-        dep_cands = station_candidates_for_city(stations_df, dep)
-        arr_cands = station_candidates_for_city(stations_df, arr)
-
-        conf, ambiguity_penalty, contamination_penalty = _apply_ambiguity_and_contamination_penalties(
-            conf=conf,
-            dep=dep,
-            arr=arr,
-            dep_cands=dep_cands,
-            arr_cands=arr_cands,
-        )
 
+def _resolve_baseline(s: str, helpful: bool) -> ResolveResult:
+    if parse_order is None:
         return ResolveResult(
-            ok=True,
-            departure=dep,
-            arrival=arr,
-            confidence=conf,
-            departure_candidates=dep_cands,
-            arrival_candidates=arr_cands,
-            debug={
-                "mode": mode,
-                "resolver": "tor.nlp.parse_order",
-                **conf_dbg,
-                "departure_candidates_count": len(dep_cands),
-                "arrival_candidates_count": len(arr_cands),
-                "ambiguity_penalty": ambiguity_penalty,
-                "contamination_penalty": contamination_penalty,
-            },
+            ok=False,
+            confidence=0.0,
+            debug={"reason": "import_error", "mode": "baseline", "details": _NLP_IMPORT_ERR, "src_dir": str(SRC_DIR)},
         )
-    
 
-    if mode == "spacy":
-        try:
-            from tor.spacy_resolver import parse_order_spacy
-        except Exception as e:
-            return ResolveResult(
-                ok=False,
-                confidence=0.0,
-                debug={"reason": "import_error_spacy", "mode": mode, "details": repr(e), "src_dir": str(SRC_DIR)},
-            )
-
-        result = parse_order_spacy(s)
-        if result is None:
-            return _invalid_result_spacy(helpful, stations_df, s)
-
-        dep, arr = result
-        conf, conf_dbg = _basic_confidence(s, dep, arr)
-
-        dep_cands = station_candidates_for_city(stations_df, dep)
-        arr_cands = station_candidates_for_city(stations_df, arr)
-
-        conf, ambiguity_penalty, contamination_penalty = _apply_ambiguity_and_contamination_penalties(
-            conf=conf,
-            dep=dep,
-            arr=arr,
-            dep_cands=dep_cands,
-            arr_cands=arr_cands,
-        )
+    result = parse_order(s)
+    if result is None:
+        return _invalid_result_baseline(helpful, _get_stations_df(), s)
+
+    dep, arr = result
+    return _resolved_result(s, "baseline", "tor.nlp.parse_order", dep, arr)
+
+
+def _spacy_result(s: str, helpful: bool, result: Optional[Tuple[str, str]]) -> ResolveResult:
+    if result is None:
+        return _invalid_result_spacy(helpful, _get_stations_df(), s)
+
+    dep, arr = result
+    return _resolved_result(s, "spacy", "tor.spacy_resolver.parse_order_spacy", dep, arr)
+
 
+def _resolve_spacy(s: str, helpful: bool) -> ResolveResult:
+    spacy_resolver = _get_spacy_resolver()
+    if spacy_resolver is None:
         return ResolveResult(
-            ok=True,
-            departure=dep,
-            arrival=arr,
-            confidence=conf,
-            departure_candidates=dep_cands,
-            arrival_candidates=arr_cands,
-            debug={
-                "mode": mode,
-                "resolver": "tor.spacy_resolver.parse_order_spacy",
-                **conf_dbg,
-                "departure_candidates_count": len(dep_cands),
-                "arrival_candidates_count": len(arr_cands),
-                "ambiguity_penalty": ambiguity_penalty,
-                "contamination_penalty": contamination_penalty,
-            },
+            ok=False,
+            confidence=0.0,
+            debug={"reason": "import_error_spacy", "mode": "spacy", "details": _SPACY_IMPORT_ERR, "src_dir": str(SRC_DIR)},
         )
+    return _spacy_result(s, helpful, spacy_resolver.parse_order_spacy(s))
+
+
+_HANDLERS = {
+    "baseline": _resolve_baseline,
+    "spacy": _resolve_spacy,
+}
+
 
-    return ResolveResult(ok=False, confidence=0.0, debug={"reason": "unknown_mode", "mode": mode})
+def resolve_sentence(sentence: str, mode: str = "baseline", helpful: bool = False) -> ResolveResult:
+    s = (sentence or "").strip()
+    if not s:
+        return ResolveResult(ok=False, confidence=0.0, debug={"reason": "empty_input", "mode": mode})
+
+    handler = _HANDLERS.get(mode)
+    if handler is None:
+        return ResolveResult(ok=False, confidence=0.0, debug={"reason": "unknown_mode", "mode": mode})
+    return handler(s, helpful)
+
+
+def resolve_sentences(sentences: List[str], mode: str = "baseline", helpful: bool = False) -> List[ResolveResult]:
+    """
+    Batch version of resolve_sentence (same results, same order).
+    In spacy mode the sentences go through nlp.pipe together (parse_orders_spacy).
+    """
+    if mode != "spacy":
+        return [resolve_sentence(s, mode=mode, helpful=helpful) for s in sentences]
+
+    spacy_resolver = _get_spacy_resolver()
+    if spacy_resolver is None:
+        return [resolve_sentence(s, mode=mode, helpful=helpful) for s in sentences]
+
+    stripped = [(s or "").strip() for s in sentences]
+    parsed = spacy_resolver.parse_orders_spacy(stripped)
+    return [
+        _spacy_result(s, helpful, result)
+        if s
+        else ResolveResult(ok=False, confidence=0.0, debug={"reason": "empty_input", "mode": mode})
+        for s, result in zip(stripped, parsed)
+    ]
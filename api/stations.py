@@ -1,9 +1,32 @@
 from __future__ import annotations
-from dataclasses import dataclass
+from collections import Counter
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+import hashlib
+import math
+import os
 import re
+import tempfile
+import weakref
+import numpy as np
 import pandas as pd
+from rapidfuzz import fuzz, process
+
+try:
+    import pyarrow
+    import pyarrow.parquet as pq
+    _HAS_PYARROW = True
+    # a missing, partial or corrupt sidecar: rebuild from the CSV instead
+    _PARQUET_READ_ERRORS: Tuple[type, ...] = (OSError, ValueError, pyarrow.ArrowException)
+except ImportError:
+    _HAS_PYARROW = False
+    _PARQUET_READ_ERRORS = (OSError, ValueError)
+
+try:
+    import ahocorasick
+except ImportError:  # optional: per-name substring loop in StationTable.token_hits
+    ahocorasick = None
 
 
 @dataclass(frozen=True)
@@ -12,16 +35,86 @@ class Station:
     uic_code: str
     latitude: float
     longitude: float
+    # radians cached once per station (used by the pathfinder distance helpers)
+    lat_rad: float = field(init=False, repr=False, compare=False)
+    lon_rad: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "lat_rad", math.radians(self.latitude))
+        object.__setattr__(self, "lon_rad", math.radians(self.longitude))
+
+
+_APOS_RE = re.compile(r"[’']")
+_KEEP_RE = re.compile(r"[^a-zàâçéèêëîïôùûüÿñæœ0-9\s\-]", re.IGNORECASE)
+_SPACE_RE = re.compile(r"\s+")
 
 
 def _normalize(s: str) -> str:
     s = (s or "").lower().strip()
-    s = re.sub(r"[’']", " ", s)
-    s = re.sub(r"[^a-zàâçéèêëîïôùûüÿñæœ0-9\s\-]", " ", s, flags=re.IGNORECASE)
-    s = re.sub(r"\s+", " ", s).strip()
+    s = _APOS_RE.sub(" ", s)
+    s = _KEEP_RE.sub(" ", s)
+    s = _SPACE_RE.sub(" ", s).strip()
+    return s
+
+
+def _normalize_series(names: pd.Series) -> pd.Series:
+    """
+    Column-wise equivalent of _normalize (runs in pandas/Arrow string kernels).
+    Names are lowercased first, so no IGNORECASE flag is needed.
+    """
+    s = names.astype(str).str.lower().str.strip()
+    s = s.str.replace(r"[’']", " ", regex=True)
+    s = s.str.replace(r"[^a-zàâçéèêëîïôùûüÿñæœ0-9\s\-]", " ", regex=True)
+    s = s.str.replace(r"\s+", " ", regex=True).str.strip()
     return s
 
 
+# (keyword, points) bonuses used to rank station candidates for a city
+_RANK_KEYWORDS = [
+    ("gare", 10),
+    ("part dieu", 8),
+    ("perrache", 7),
+    ("saint", 2),
+    ("st", 2),
+    ("centre", 2),
+]
+
+
+def _static_rank_score(station_norm: pd.Series) -> pd.Series:
+    """
+    Query-independent part of the candidate ranking: keyword bonuses + short-name bonus.
+    """
+    score = pd.Series(0, index=station_norm.index, dtype="int64")
+    for kw, pts in _RANK_KEYWORDS:
+        score += station_norm.str.contains(kw, regex=False).astype("int64") * pts
+    score += (12 - station_norm.str.len().clip(upper=60) // 5).clip(lower=0)
+    return score
+
+
+# columns computed by load_stations (a cached parquet missing one is rebuilt)
+_DERIVED_COLUMNS = ["station_norm", "station_norm_padded", "static_score"]
+_STRING_COLUMNS = ["station_norm", "station_norm_padded"]
+
+# bump whenever _normalize / _normalize_series or a derived column changes meaning
+_CACHE_VERSION = 1
+
+# parquet schema metadata field holding the _cache_key() a sidecar was built with
+_CACHE_KEY_FIELD = b"tor.stations.cache_key"
+
+# sidecars are shared between users: give them the mode open() would (mkstemp uses 0600)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _cache_key() -> bytes:
+    """
+    Key of everything the derived columns depend on, stored in the sidecar's metadata
+    so a sidecar written by older code is rebuilt instead of read.
+    """
+    spec = repr((_CACHE_VERSION, _DERIVED_COLUMNS, _RANK_KEYWORDS))
+    return hashlib.sha1(spec.encode("utf-8")).hexdigest()[:10].encode("ascii")
+
+
 def load_stations(csv_path: Path) -> pd.DataFrame:
     """
     Loads your cleaned stations CSV.
@@ -30,16 +123,177 @@ def load_stations(csv_path: Path) -> pd.DataFrame:
       - uic_code
       - latitude
       - longitude
+
+    The normalized table is cached next to the CSV as a parquet sidecar
+    (reused as long as it is newer than the CSV and its metadata carries
+    the current _cache_key, i.e. same _CACHE_VERSION / ranking keywords).
     """
+    parquet_path = csv_path.with_suffix(".parquet")
+    if _HAS_PYARROW and parquet_path.exists() and parquet_path.stat().st_mtime >= csv_path.stat().st_mtime:
+        try:
+            metadata = pq.read_schema(parquet_path).metadata or {}
+            cached = pd.read_parquet(parquet_path) if metadata.get(_CACHE_KEY_FIELD) == _cache_key() else None
+        except _PARQUET_READ_ERRORS:
+            cached = None
+        if cached is not None and all(col in cached.columns for col in _DERIVED_COLUMNS):
+            return cached
+
     df = pd.read_csv(csv_path)
     for col in ["station_name", "uic_code", "latitude", "longitude"]:
         if col not in df.columns:
             raise ValueError(f"Missing column '{col}' in {csv_path}")
     df = df.copy()
-    df["station_norm"] = df["station_name"].astype(str).map(_normalize)
+    df["station_norm"] = _normalize_series(df["station_name"])
+    # space-padded copy: whole-word lookups become a plain substring search
+    df["station_norm_padded"] = " " + df["station_norm"] + " "
+    df["static_score"] = _static_rank_score(df["station_norm"])
+    if _HAS_PYARROW:
+        for col in _STRING_COLUMNS:
+            df[col] = df[col].astype("string[pyarrow]")
+        _write_sidecar(df, parquet_path)
     return df
 
 
+def _write_sidecar(df: pd.DataFrame, parquet_path: Path) -> None:
+    """
+    Write the parquet cache atomically: a temp file in the same directory is renamed
+    into place, so concurrent loaders never see a half-written sidecar.
+    """
+    try:
+        fd, tmp_name = tempfile.mkstemp(dir=parquet_path.parent, prefix=f".{parquet_path.name}.", suffix=".tmp")
+    except OSError:
+        return
+    os.close(fd)
+    try:
+        table = pyarrow.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), _CACHE_KEY_FIELD: _cache_key()})
+        pq.write_table(table, tmp_name)
+        os.chmod(tmp_name, 0o666 & ~_UMASK)
+        os.replace(tmp_name, parquet_path)
+    except OSError:
+        pass
+    finally:
+        # still there only if writing or renaming failed
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+
+
+@dataclass(frozen=True)
+class StationTable:
+    """
+    Column arrays (struct-of-arrays) view of a stations table.
+    Queries work on row positions; Station objects are only built for returned rows.
+    """
+    names: np.ndarray
+    uics: np.ndarray
+    lats: np.ndarray
+    lons: np.ndarray
+    norm: np.ndarray
+    uic_index: Dict[str, int]
+    # all norm names joined by "\n" (one string to scan) + offset where each name starts
+    norm_joined: str = field(repr=False, compare=False)
+    norm_starts: np.ndarray = field(repr=False, compare=False)
+    # n_words -> (first n words of each norm name, their lengths), filled on demand
+    _heads: Dict[int, Tuple[np.ndarray, np.ndarray]] = field(default_factory=dict, repr=False, compare=False)
+
+    @classmethod
+    def from_df(cls, stations_df: pd.DataFrame) -> "StationTable":
+        uics = stations_df["uic_code"].astype(str).to_numpy(dtype=object)
+        uic_index: Dict[str, int] = {}
+        for i, code in enumerate(uics):
+            uic_index.setdefault(code, i)
+        norm = stations_df["station_norm"].to_numpy(dtype=object)
+        starts = np.zeros(len(norm), dtype=np.int64)
+        if len(norm) > 1:
+            lens = np.fromiter((len(n) + 1 for n in norm[:-1]), dtype=np.int64, count=len(norm) - 1)
+            starts[1:] = np.cumsum(lens)
+        return cls(
+            names=stations_df["station_name"].astype(str).to_numpy(dtype=object),
+            uics=uics,
+            lats=stations_df["latitude"].to_numpy(dtype=np.float64),
+            lons=stations_df["longitude"].to_numpy(dtype=np.float64),
+            norm=norm,
+            uic_index=uic_index,
+            norm_joined="\n".join(norm),
+            norm_starts=starts,
+        )
+
+    def heads(self, n_words: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        First n_words words of every normalized name, with their lengths (computed once per n_words).
+        """
+        cached = self._heads.get(n_words)
+        if cached is None:
+            heads = np.array([" ".join(n.split()[:n_words]) for n in self.norm], dtype=object)
+            lens = np.fromiter((len(h) for h in heads), dtype=np.int64, count=len(heads))
+            cached = self._heads[n_words] = (heads, lens)
+        return cached
+
+    def token_hits(self, tokens: List[str]) -> np.ndarray:
+        """
+        For every row, how many of `tokens` (repeats included) occur in the normalized name.
+        With pyahocorasick, one automaton scan over the joined names replaces the per-name loop.
+        """
+        if ahocorasick is None:
+            return np.fromiter(
+                (sum(1 for tok in tokens if tok in n) for n in self.norm),
+                dtype=np.int64,
+                count=len(self.norm),
+            )
+        mult = Counter(tokens)
+        if not mult:
+            return np.zeros(len(self.norm), dtype=np.int64)
+
+        automaton = ahocorasick.Automaton()
+        for tok_id, tok in enumerate(mult):
+            automaton.add_word(tok, (tok_id, len(tok)))
+        automaton.make_automaton()
+
+        found = np.array(
+            [(end - tok_len + 1, tok_id) for end, (tok_id, tok_len) in automaton.iter(self.norm_joined)],
+            dtype=np.int64,
+        ).reshape(-1, 2)
+
+        hits = np.zeros(len(self.norm), dtype=np.int64)
+        if found.size:
+            rows = np.searchsorted(self.norm_starts, found[:, 0], side="right") - 1
+            # a token found several times in one name still counts once for that name
+            pairs = np.unique(rows * len(mult) + found[:, 1])
+            weights = np.fromiter(mult.values(), dtype=np.int64, count=len(mult))
+            np.add.at(hits, pairs // len(mult), weights[pairs % len(mult)])
+        return hits
+
+    def to_stations(self, rows) -> List[Station]:
+        return [
+            Station(
+                station_name=str(self.names[i]),
+                uic_code=str(self.uics[i]),
+                latitude=float(self.lats[i]),
+                longitude=float(self.lons[i]),
+            )
+            for i in rows
+        ]
+
+
+# id(stations_df) -> StationTable; entries are dropped with their frame
+_TABLES: Dict[int, StationTable] = {}
+
+
+def station_table(stations_df: pd.DataFrame) -> StationTable:
+    """
+    StationTable for a stations DataFrame, built on first use and reused afterwards.
+    """
+    key = id(stations_df)
+    table = _TABLES.get(key)
+    if table is None:
+        table = StationTable.from_df(stations_df)
+        _TABLES[key] = table
+        weakref.finalize(stations_df, _TABLES.pop, key, None)
+    return table
+
+
 def station_candidates_for_city(
     stations_df: pd.DataFrame,
     city: str,
@@ -54,60 +308,82 @@ def station_candidates_for_city(
     city_norm = _normalize(city)
     if not city_norm:
         return []
-    pattern = rf"(?:^|\s){re.escape(city_norm)}(?:\s|$)"
-    mask = stations_df["station_norm"].str.contains(pattern, regex=True, na=False)
+    needle = f" {city_norm} "
+    mask = stations_df["station_norm_padded"].str.contains(needle, regex=False, na=False)
 
-    sub = stations_df[mask].copy()
-    if sub.empty:
+    rows = np.flatnonzero(mask.to_numpy(dtype=bool))
+    if rows.size == 0:
         return []
 
-    # Heuristic ranking
-    def score(name_norm: str) -> int:
-        sc = 0
-        if name_norm.startswith(city_norm + " "):
-            sc += 20
-        for kw, pts in [
-            ("gare", 10),
-            ("part dieu", 8),
-            ("perrache", 7),
-            ("saint", 2),
-            ("st", 2),
-            ("centre", 2),
-        ]:
-            if kw in name_norm:
-                sc += pts
-        sc += max(0, 12 - min(len(name_norm), 60) // 5)
-        return sc
-
-    sub["rank_score"] = sub["station_norm"].map(score)
-    sub = sub.sort_values(["rank_score", "station_name"], ascending=[False, True]).head(limit)
-
-    out: List[Station] = []
-    for _, r in sub.iterrows():
-        out.append(
-            Station(
-                station_name=str(r["station_name"]),
-                uic_code=str(r["uic_code"]),
-                latitude=float(r["latitude"]),
-                longitude=float(r["longitude"]),
-            )
-        )
+    # Heuristic ranking: precomputed keyword/length score + query-dependent prefix bonus
+    prefix = stations_df["station_norm"].iloc[rows].str.startswith(city_norm + " ")
+    score = stations_df["static_score"].to_numpy()[rows] + prefix.to_numpy(dtype=np.int64) * 20
+
+    table = station_table(stations_df)
+    order = np.lexsort((table.names[rows], -score))[:limit]
+    return table.to_stations(rows[order])
+
+
+def station_candidates_fuzzy(
+    stations_df: pd.DataFrame,
+    city: str,
+    limit: int = 12,
+    score_cutoff: int = 80,
+    substring_hits: Optional[List[Station]] = None,
+) -> List[Station]:
+    """
+    Typo/accent-tolerant variant of station_candidates_for_city:
+      1) substring candidates first (fast path)
+      2) remaining slots filled with RapidFuzz ratio matches between the city
+         and the first words of each station name (as many words as the city has)
+    Callers that already ran station_candidates_for_city(city, limit) pass its
+    result as substring_hits so the substring scan is not repeated.
+    """
+    if substring_hits is None:
+        out = station_candidates_for_city(stations_df, city, limit=limit)
+    else:
+        out = list(substring_hits)
+    if len(out) >= limit:
+        return out
+
+    city_norm = _normalize(city)
+    if not city_norm:
+        return out
+
+    table = station_table(stations_df)
+    heads, lens = table.heads(len(city_norm.split()))
+
+    # ratio = 200 * matches / (len_a + len_b) and matches <= min(len_a, len_b):
+    # heads that cannot reach the cutoff are dropped before calling RapidFuzz
+    n = len(city_norm)
+    rows = np.flatnonzero(200 * np.minimum(lens, n) >= score_cutoff * (lens + n))
+    matches = process.extract(
+        city_norm,
+        heads[rows],
+        scorer=fuzz.ratio,
+        limit=limit + len(out),
+        score_cutoff=score_cutoff,
+    )
+
+    seen = {(st.station_name, st.uic_code) for st in out}
+    for st in table.to_stations([rows[i] for _head, _score, i in matches]):
+        if (st.station_name, st.uic_code) in seen:
+            continue
+        seen.add((st.station_name, st.uic_code))
+        out.append(st)
+        if len(out) >= limit:
+            break
     return out
 
 
 def find_station_by_uic(stations_df: pd.DataFrame, uic_code: str) -> Optional[Station]:
     if not uic_code:
         return None
-    sub = stations_df[stations_df["uic_code"].astype(str) == str(uic_code)]
-    if sub.empty:
+    table = station_table(stations_df)
+    i = table.uic_index.get(str(uic_code))
+    if i is None:
         return None
-    r = sub.iloc[0]
-    return Station(
-        station_name=str(r["station_name"]),
-        uic_code=str(r["uic_code"]),
-        latitude=float(r["latitude"]),
-        longitude=float(r["longitude"]),
-    )
+    return table.to_stations([i])[0]
 
 
 def station_candidates_from_free_text(
@@ -131,27 +407,12 @@ def station_candidates_from_free_text(
     if not tokens:
         return []
 
-    sub = stations_df.copy()
-    # count token hits
-    def hit_count(name_norm: str) -> int:
-        return sum(1 for tok in tokens if tok in name_norm)
-
-    sub["hits"] = sub["station_norm"].map(hit_count)
-    sub = sub[sub["hits"] > 0].copy()
-    if sub.empty:
+    table = station_table(stations_df)
+    hits = table.token_hits(tokens)
+    rows = np.flatnonzero(hits > 0)
+    if rows.size == 0:
         return []
 
-    sub["name_len"] = sub["station_norm"].str.len()
-    sub = sub.sort_values(["hits", "name_len", "station_name"], ascending=[False, True, True]).head(limit)
-
-    out: List[Station] = []
-    for _, r in sub.iterrows():
-        out.append(
-            Station(
-                station_name=str(r["station_name"]),
-                uic_code=str(r["uic_code"]),
-                latitude=float(r["latitude"]),
-                longitude=float(r["longitude"]),
-            )
-        )
-    return out
+    name_len = np.fromiter((len(n) for n in table.norm[rows]), dtype=np.int64, count=rows.size)
+    order = np.lexsort((table.names[rows], name_len, -hits[rows]))[:limit]
+    return table.to_stations(rows[order])
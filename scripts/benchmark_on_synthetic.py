@@ -2,11 +2,18 @@ from __future__ import annotations
 
 import argparse
 import csv
+import os
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain, islice
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, List, Optional, Tuple
 
-from api.resolver_service import resolve_sentence
+from api.resolver_service import resolve_sentences
+
+# sentences per worker task (and per nlp.pipe pass in spacy mode)
+_CHUNK_SIZE = 256
 
 
 def read_sentences(path: Path):
@@ -23,38 +30,65 @@ def read_sentences(path: Path):
                 yield sid, sent
 
 
+def resolve_chunk(sents: List[str], mode: str, helpful: bool) -> List[Tuple[bool, Optional[str]]]:
+    """
+    (ok, invalid reason) per sentence; only these small tuples cross the process boundary.
+    The chunk is resolved with one resolve_sentences call (one nlp.pipe pass in spacy mode).
+    """
+    out: List[Tuple[bool, Optional[str]]] = []
+    for res in resolve_sentences(sents, mode=mode, helpful=helpful):
+        if res.ok:
+            out.append((True, None))
+            continue
+        reason = None
+        if res.debug and "reason" in res.debug:
+            reason = str(res.debug["reason"])
+        out.append((False, reason or "unknown"))
+    return out
+
+
 def main() -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--in", dest="inp", type=str, default="data/synthetic/synthetic_10k.csv")
     ap.add_argument("--mode", type=str, choices=["baseline", "spacy"], default="baseline")
     ap.add_argument("--helpful", action="store_true")
     ap.add_argument("--limit", type=int, default=0, help="0 = no limit")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="1 = no process pool")
     args = ap.parse_args()
 
     path = Path(args.inp)
     if not path.exists():
         raise SystemExit(f"File not found: {path}")
 
-    n = 0
+    sents = [sent for _sid, sent in islice(read_sentences(path), args.limit or None)]
+
+    # identical sentences (frequent with template-generated data) are resolved once
+    todo = list(dict.fromkeys(sents))
+
+    resolve = partial(resolve_chunk, mode=args.mode, helpful=args.helpful)
+    if args.workers > 1 and len(todo) > 1:
+        # longest sentences first so the slowest chunks do not end up last in the pool
+        todo.sort(key=len, reverse=True)
+        chunks = [todo[i:i + _CHUNK_SIZE] for i in range(0, len(todo), _CHUNK_SIZE)]
+        with ProcessPoolExecutor(max_workers=args.workers) as ex:
+            outcomes = list(chain.from_iterable(ex.map(resolve, chunks)))
+    else:
+        outcomes = resolve(todo)
+    outcome_of = dict(zip(todo, outcomes))
+
+    n = len(sents)
     n_ok = 0
     n_invalid = 0
     reasons = Counter()
 
-    for sid, sent in read_sentences(path):
-        n += 1
-        res = resolve_sentence(sent, mode=args.mode, helpful=args.helpful)
-
-        if res.ok:
+    # tally in file order (keeps the tie order of reasons.most_common)
+    for sent in sents:
+        ok, reason = outcome_of[sent]
+        if ok:
             n_ok += 1
         else:
             n_invalid += 1
-            reason = None
-            if res.debug and "reason" in res.debug:
-                reason = str(res.debug["reason"])
-            reasons[reason or "unknown"] += 1
-
-        if args.limit and n >= args.limit:
-            break
+            reasons[reason] += 1
 
     print("=== BENCHMARK ===")
     print("file:", str(path))
@@ -2,11 +2,15 @@ import sys
 import csv
 from pathlib import Path
 
+import numpy as np
+
 # Make src importable when running from repo root
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
 
 from tor.nlp import parse_order
 
+MAX_ERRORS = 20
+
 
 def safe_str(x):
     return "" if x is None else str(x)
@@ -18,44 +22,51 @@ def main():
         print("ERROR: data/eval.csv not found")
         return 1
 
-    rows = []
-    with dataset_path.open("r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for r in reader:
-            rows.append(r)
-
-    tp = fp = fn = tn = 0
+    exp_valid_col = []
+    pred_valid_col = []
+    pair_ok_col = []
     errors = []
 
-    for r in rows:
-        sid = r["sentence_id"]
-        sent = r["sentence"]
-        exp_valid = int(r["expected_valid"])
-        exp_dep = r["expected_dep"].strip() or None
-        exp_dest = r["expected_dest"].strip() or None
-
-        pred = parse_order(sent)
-        pred_valid = 1 if pred is not None else 0
-
-        if exp_valid == 1 and pred_valid == 1:
-            # valid predicted valid: check exact match
-            pred_dep, pred_dest = pred
-            if pred_dep == exp_dep and pred_dest == exp_dest:
-                tp += 1
-            else:
-                # wrong extraction counts as FP + FN in strict evaluation
-                fp += 1
-                fn += 1
-                errors.append((sid, sent, "WRONG_PAIR", f"expected=({exp_dep},{exp_dest})", f"pred=({pred_dep},{pred_dest})"))
-        elif exp_valid == 0 and pred_valid == 0:
-            tn += 1
-        elif exp_valid == 0 and pred_valid == 1:
-            fp += 1
-            pred_dep, pred_dest = pred
-            errors.append((sid, sent, "FALSE_POSITIVE", "expected=INVALID", f"pred=({pred_dep},{pred_dest})"))
-        elif exp_valid == 1 and pred_valid == 0:
-            fn += 1
-            errors.append((sid, sent, "FALSE_NEGATIVE", f"expected=({exp_dep},{exp_dest})", "pred=INVALID"))
+    # single streaming pass: parse each row, keep only the metric columns and the printed errors
+    with dataset_path.open("r", encoding="utf-8") as f:
+        for r in csv.DictReader(f):
+            sid = r["sentence_id"]
+            sent = r["sentence"]
+            exp_valid = int(r["expected_valid"]) == 1
+            exp_dep = r["expected_dep"].strip() or None
+            exp_dest = r["expected_dest"].strip() or None
+
+            pred = parse_order(sent)
+            pred_valid = pred is not None
+            pair_ok = pred_valid and pred[0] == exp_dep and pred[1] == exp_dest
+
+            exp_valid_col.append(exp_valid)
+            pred_valid_col.append(pred_valid)
+            pair_ok_col.append(pair_ok)
+
+            if len(errors) < MAX_ERRORS and (exp_valid != pred_valid or (pred_valid and not pair_ok)):
+                expected = f"expected=({exp_dep},{exp_dest})"
+                if exp_valid and pred_valid:
+                    pred_dep, pred_dest = pred
+                    errors.append((sid, sent, "WRONG_PAIR", expected, f"pred=({pred_dep},{pred_dest})"))
+                elif pred_valid:
+                    pred_dep, pred_dest = pred
+                    errors.append((sid, sent, "FALSE_POSITIVE", "expected=INVALID", f"pred=({pred_dep},{pred_dest})"))
+                else:
+                    errors.append((sid, sent, "FALSE_NEGATIVE", expected, "pred=INVALID"))
+
+    exp_valid = np.array(exp_valid_col, dtype=bool)
+    pred_valid = np.array(pred_valid_col, dtype=bool)
+    pair_ok = np.array(pair_ok_col, dtype=bool)
+
+    both_valid = exp_valid & pred_valid
+    wrong_pair = both_valid & ~pair_ok
+
+    # wrong extraction counts as FP + FN in strict evaluation
+    tp = int((both_valid & pair_ok).sum())
+    fp = int((wrong_pair | (~exp_valid & pred_valid)).sum())
+    fn = int((wrong_pair | (exp_valid & ~pred_valid)).sum())
+    tn = int((~exp_valid & ~pred_valid).sum())
 
     precision = tp / (tp + fp) if (tp + fp) else 0.0
     recall = tp / (tp + fn) if (tp + fn) else 0.0
@@ -68,8 +79,8 @@ def main():
     print(f"F1={f1:.3f}")
 
     if errors:
-        print("\n=== Errors (up to 20) ===")
-        for e in errors[:20]:
+        print(f"\n=== Errors (up to {MAX_ERRORS}) ===")
+        for e in errors:
             sid, sent, etype, exp, pred = e
             print(f"- id={sid} | {etype}")
             print(f"  sentence: {sent}")
@@ -2,14 +2,26 @@ import sys
 import csv
 from pathlib import Path
 
+import numpy as np
+
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
 
-from tor.nlp import parse_order
+from tor.nlp import parse_orders
 
 
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python scripts/evaluate_file.py data/synthetic_eval.csv")
+        print("Usage: python scripts/evaluate_file.py data/synthetic_eval.csv [baseline|spacy]")
+        return 1
+
+    mode = sys.argv[2] if len(sys.argv) > 2 else "baseline"
+    if mode == "baseline":
+        parse_batch = parse_orders
+    elif mode == "spacy":
+        # spaCy is heavy to import: only loaded when asked for
+        from tor.spacy_resolver import parse_orders_spacy as parse_batch
+    else:
+        print(f"ERROR: unknown mode: {mode}")
         return 1
 
     dataset_path = Path(sys.argv[1])
@@ -23,36 +35,47 @@ def main():
         for r in reader:
             rows.append(r)
 
-    tp = fp = fn = tn = 0
-    errors = []
+    # batch parse (parse_orders / parse_orders_spacy), then one pass to fill every column the metrics need
+    preds = parse_batch([r["sentence"] for r in rows])
+    n = len(rows)
+    exp_dep = [None] * n
+    exp_dest = [None] * n
+    exp_valid = np.zeros(n, dtype=bool)
+    pred_valid = np.zeros(n, dtype=bool)
+    pair_ok = np.zeros(n, dtype=bool)
+    for i, (r, pred) in enumerate(zip(rows, preds)):
+        dep = r["expected_dep"].strip() or None
+        dest = r["expected_dest"].strip() or None
+        exp_dep[i], exp_dest[i] = dep, dest
+        exp_valid[i] = int(r["expected_valid"]) == 1
+        if pred is not None:
+            pred_valid[i] = True
+            pair_ok[i] = pred[0] == dep and pred[1] == dest
 
-    for r in rows:
-        sid = r["sentence_id"]
-        sent = r["sentence"]
-        exp_valid = int(r["expected_valid"])
-        exp_dep = r["expected_dep"].strip() or None
-        exp_dest = r["expected_dest"].strip() or None
-
-        pred = parse_order(sent)
-        pred_valid = 1 if pred is not None else 0
-
-        if exp_valid == 1 and pred_valid == 1:
-            pred_dep, pred_dest = pred
-            if pred_dep == exp_dep and pred_dest == exp_dest:
-                tp += 1
-            else:
-                fp += 1
-                fn += 1
-                errors.append((sid, sent, "WRONG_PAIR", f"expected=({exp_dep},{exp_dest})", f"pred=({pred_dep},{pred_dest})"))
-        elif exp_valid == 0 and pred_valid == 0:
-            tn += 1
-        elif exp_valid == 0 and pred_valid == 1:
-            fp += 1
-            pred_dep, pred_dest = pred
+    both_valid = exp_valid & pred_valid
+    wrong_pair = both_valid & ~pair_ok
+    false_pos = ~exp_valid & pred_valid
+    false_neg = exp_valid & ~pred_valid
+
+    # wrong extraction counts as FP + FN in strict evaluation
+    tp = int((both_valid & pair_ok).sum())
+    fp = int((wrong_pair | false_pos).sum())
+    fn = int((wrong_pair | false_neg).sum())
+    tn = int((~exp_valid & ~pred_valid).sum())
+
+    errors = []
+    for i in np.flatnonzero(wrong_pair | false_pos | false_neg):
+        sid = rows[i]["sentence_id"]
+        sent = rows[i]["sentence"]
+        expected = f"expected=({exp_dep[i]},{exp_dest[i]})"
+        if wrong_pair[i]:
+            pred_dep, pred_dest = preds[i]
+            errors.append((sid, sent, "WRONG_PAIR", expected, f"pred=({pred_dep},{pred_dest})"))
+        elif false_pos[i]:
+            pred_dep, pred_dest = preds[i]
             errors.append((sid, sent, "FALSE_POSITIVE", "expected=INVALID", f"pred=({pred_dep},{pred_dest})"))
-        elif exp_valid == 1 and pred_valid == 0:
-            fn += 1
-            errors.append((sid, sent, "FALSE_NEGATIVE", f"expected=({exp_dep},{exp_dest})", "pred=INVALID"))
+        else:
+            errors.append((sid, sent, "FALSE_NEGATIVE", expected, "pred=INVALID"))
 
     precision = tp / (tp + fp) if (tp + fp) else 0.0
     recall = tp / (tp + fn) if (tp + fn) else 0.0
@@ -60,6 +83,7 @@ def main():
 
     print("=== Evaluation Results ===")
     print(f"file={dataset_path}")
+    print(f"mode={mode}")
     print(f"TP={tp} FP={fp} FN={fn} TN={tn}")
     print(f"Precision={precision:.3f}")
     print(f"Recall={recall:.3f}")
@@ -1,9 +1,13 @@
 import random
-import csv
+import sys
 from pathlib import Path
 
 from unidecode import unidecode
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from tor.csv_quote import quote_field
+
 random.seed(42)
 
 # Load cities from data/cities.txt
@@ -13,6 +17,8 @@ def load_cities():
     return cities
 
 CITIES = load_cities()
+# ASCII spelling used by typo(), computed once instead of per call
+CITIES_ASCII = [unidecode(c) for c in CITIES]
 
 VALID_TEMPLATES = [
     "Je veux aller de {dep} à {dest}",
@@ -43,9 +49,9 @@ DEP_ONLY_TEMPLATES = [
     "Depuis {dep}",
 ]
 
-def typo(city: str) -> str:
-    """Create a mild typo: remove one character OR swap two adjacent characters."""
-    c = unidecode(city)
+def typo(idx: int) -> str:
+    """Create a mild typo on CITIES[idx]: remove one character OR swap two adjacent characters."""
+    c = CITIES_ASCII[idx]
     if len(c) < 4:
         return c
     mode = random.choice(["drop", "swap"])
@@ -59,11 +65,12 @@ def typo(city: str) -> str:
     return "".join(s)
 
 def make_valid(with_typos_prob=0.25):
-    dep, dest = random.sample(CITIES, 2)
+    i_dep, i_dest = random.sample(range(len(CITIES)), 2)
+    dep, dest = CITIES[i_dep], CITIES[i_dest]
     tmpl = random.choice(VALID_TEMPLATES)
     if random.random() < with_typos_prob:
-        dep_out = typo(dep) if random.random() < 0.5 else dep
-        dest_out = typo(dest) if random.random() < 0.5 else dest
+        dep_out = typo(i_dep) if random.random() < 0.5 else dep
+        dest_out = typo(i_dest) if random.random() < 0.5 else dest
     else:
         dep_out, dest_out = dep, dest
     sent = tmpl.format(dep=dep_out, dest=dest_out)
@@ -93,7 +100,8 @@ def make_incomplete():
     return sent, "", "", 0
 
 def generate(n=500, out_path=Path("data") / "synthetic_eval.csv"):
-    rows = []
+    # plain string rows: only the sentence can need quoting, city names and ids never do
+    lines = ["sentence_id,sentence,expected_dep,expected_dest,expected_valid\r\n"]
     for i in range(1, n + 1):
         r = random.random()
         if r < 0.55:
@@ -105,19 +113,11 @@ def generate(n=500, out_path=Path("data") / "synthetic_eval.csv"):
         else:
             sent, dep, dest, v = make_ambiguous()
 
-        rows.append({
-            "sentence_id": str(i),
-            "sentence": sent,
-            "expected_dep": dep,
-            "expected_dest": dest,
-            "expected_valid": str(v),
-        })
+        lines.append(f"{i},{quote_field(sent)},{dep},{dest},{v}\r\n")
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
     with out_path.open("w", encoding="utf-8", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=["sentence_id","sentence","expected_dep","expected_dest","expected_valid"])
-        w.writeheader()
-        w.writerows(rows)
+        f.writelines(lines)
 
     print(f"Wrote {n} rows to {out_path}")
 
@@ -1,16 +1,37 @@
 from __future__ import annotations
 
 import argparse
-import csv
 import random
 import re
+import sys
 import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
 from pathlib import Path
 from typing import List, Tuple
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from tor.csv_quote import quote_field
+
+
+class _AccentTable(dict):
+    """
+    str.translate table: code point -> same char with combining marks (Mn) removed.
+    Entries are filled on first sight, so each distinct character is decomposed once.
+    """
+
+    def __missing__(self, cp: int) -> str:
+        out = "".join(c for c in unicodedata.normalize("NFD", chr(cp)) if unicodedata.category(c) != "Mn")
+        self[cp] = out
+        return out
+
+
+_ACCENT_TABLE = _AccentTable()
+
 
 def strip_accents(s: str) -> str:
-    return "".join(c for c in unicodedata.normalize("NFD", s) if unicodedata.category(c) != "Mn")
+    return s.translate(_ACCENT_TABLE)
 
 
 def random_case(s: str) -> str:
@@ -52,6 +73,10 @@ def inject_typos(city: str) -> str:
     return "".join(s_list)
 
 
+_WS_RE = re.compile(r"\s+")
+_PUNCT = ("", ".", "!!", " ?", " ...", "!!!")
+
+
 def inject_noise(sentence: str) -> str:
     s = sentence
 
@@ -68,12 +93,12 @@ def inject_noise(sentence: str) -> str:
         s = s.replace("’", "'").replace("'", " ")
 
     if random.random() < 0.20:
-        s = re.sub(r"\s+", " ", s).strip()
+        s = _WS_RE.sub(" ", s).strip()
         s = " " * random.randint(0, 2) + s + " " * random.randint(0, 2)
 
     # punctuation noise
     if random.random() < 0.25:
-        s = s + random.choice(["", ".", "!!", " ?", " ...", "!!!"])
+        s = s + random.choice(_PUNCT)
 
     return s
 
@@ -137,12 +162,16 @@ def sample_distinct(cities: List[str], k: int) -> List[str]:
     return random.sample(cities, k)
 
 
-def generate_dataset(
+def _generate_chunk(
+    start_id: int,
+    count: int,
+    seed: int,
     cities: List[str],
-    n: int,
     invalid_ratio: float,
-    seed: int,
 ) -> List[Tuple[str, str]]:
+    """
+    Rows S{start_id} .. S{start_id + count - 1}, drawn from their own seeded random stream.
+    """
     random.seed(seed)
 
     order_templates = make_order_templates()
@@ -150,7 +179,7 @@ def generate_dataset(
 
     rows: List[Tuple[str, str]] = []
 
-    for i in range(1, n + 1):
+    for i in range(start_id, start_id + count):
         sid = f"S{i:05d}"
 
         if random.random() < invalid_ratio:
@@ -177,11 +206,37 @@ def generate_dataset(
     return rows
 
 
+def generate_dataset(
+    cities: List[str],
+    n: int,
+    invalid_ratio: float,
+    seed: int,
+    workers: int = 1,
+) -> List[Tuple[str, str]]:
+    """
+    workers=1 reproduces the single-stream dataset for `seed`.
+    With more workers, chunk i is drawn with seed + i: deterministic for a given
+    (seed, workers) pair, but not the same rows as the single-stream run.
+    """
+    if workers <= 1 or n < 2:
+        return _generate_chunk(1, n, seed, cities, invalid_ratio)
+
+    k = min(workers, n)
+    bounds = [n * j // k for j in range(k + 1)]
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        futures = [
+            ex.submit(_generate_chunk, lo + 1, hi - lo, seed + i, cities, invalid_ratio)
+            for i, (lo, hi) in enumerate(zip(bounds[:-1], bounds[1:]))
+        ]
+        return list(chain.from_iterable(f.result() for f in futures))
+
+
 def main() -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--n", type=int, default=10000)
     ap.add_argument("--invalid-ratio", type=float, default=0.25)
     ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--workers", type=int, default=1, help=">1 = parallel chunks seeded seed+i (different rows)")
     ap.add_argument("--cities", type=str, default="data/cities.txt")
     ap.add_argument("--out", type=str, default="data/synthetic/synthetic_10k.csv")
     args = ap.parse_args()
@@ -194,12 +249,13 @@ def main() -> int:
     if len(cities) < 5:
         raise SystemExit(f"Not enough cities in {cities_path} (got {len(cities)}). Need at least 5.")
 
-    rows = generate_dataset(cities=cities, n=args.n, invalid_ratio=args.invalid_ratio, seed=args.seed)
+    rows = generate_dataset(
+        cities=cities, n=args.n, invalid_ratio=args.invalid_ratio, seed=args.seed, workers=args.workers
+    )
 
+    # ids never need quoting; sentences are quoted like csv.writer does (QUOTE_MINIMAL)
     with open(out_path, "w", encoding="utf-8", newline="") as f:
-        w = csv.writer(f)
-        for sid, sent in rows:
-            w.writerow([sid, sent])
+        f.writelines(f"{sid},{quote_field(sent)}\r\n" for sid, sent in rows)
 
     print(f"Wrote {len(rows)} rows to {out_path}")
     return 0
@@ -1,15 +1,6 @@
 import pandas as pd
 from pathlib import Path
 
-def split_coords(coord_str):
-    if pd.isna(coord_str):
-        return None, None
-    try:
-        lat, lon = coord_str.split(",")
-        return float(lat.strip()), float(lon.strip())
-    except Exception:
-        return None, None
-
 def normalize_col(col):
     """
     Remove BOM and strip spaces from column names.
@@ -45,10 +36,15 @@ def main():
 
     df = df.rename(columns=rename_map)
 
-    # Split coordinates
-    df[["latitude", "longitude"]] = df["geo"].apply(
-        lambda x: pd.Series(split_coords(x))
-    )
+    # Split coordinates ("lat, lon"); unparsable parts become NaN and are dropped below.
+    # extract always yields both columns, even if no value contains a comma.
+    # to_numeric only flags valid numbers: the values are converted with astype(float),
+    # which parses exactly like float() (to_numeric can be off in the last digit).
+    coords = df["geo"].astype("string").str.extract(r"^([^,]*),(.*)$")
+    for i, col in enumerate(["latitude", "longitude"]):
+        part = coords[i].str.strip()
+        valid = pd.to_numeric(part, errors="coerce").notna()
+        df[col] = part.where(valid).astype(float)
 
     # Keep useful columns only
     clean_df = df[[
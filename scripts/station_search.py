@@ -2,6 +2,12 @@ import sys
 import pandas as pd
 from pathlib import Path
 
+try:
+    import pyarrow  # noqa: F401
+    _HAS_PYARROW = True
+except ImportError:
+    _HAS_PYARROW = False
+
 def main():
     if len(sys.argv) < 2:
         print("Usage: python scripts/station_search.py <query> [k]")
@@ -17,7 +23,12 @@ def main():
         return
 
     df = pd.read_csv(path, encoding="utf-8")
-    mask = df["station_name"].astype(str).str.lower().str.contains(query, na=False)
+    names = df["station_name"]
+    if _HAS_PYARROW:
+        # Arrow-backed strings: pandas runs the search as a pyarrow.compute substring kernel
+        names = names.astype("string[pyarrow]")
+    # literal, case-insensitive substring match (no lowered copy, no regex per row)
+    mask = names.str.contains(query, case=False, regex=False, na=False)
     hits = df[mask].head(k)
 
     print(f"=== Station search: '{query}' (top {k}) ===")
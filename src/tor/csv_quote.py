@@ -0,0 +1,8 @@
+def quote_field(s: str) -> str:
+    """
+    CSV-quote one field the way csv.writer does (QUOTE_MINIMAL).
+    For scripts that build CSV lines with f-strings instead of csv.writer.
+    """
+    if "," in s or '"' in s or "\n" in s or "\r" in s:
+        return '"' + s.replace('"', '""') + '"'
+    return s
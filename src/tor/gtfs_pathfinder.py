@@ -63,13 +63,6 @@ def _extract_uic_candidates(uic_field: str) -> List[str]:
     return out
 
 
-def _extract_uic_from_stop_id(stop_id: str) -> Optional[str]:
-    if not stop_id:
-        return None
-    m = re.search(r"(\d{8})", stop_id)
-    return m.group(1) if m else None
-
-
 class GtfsIndex:
     def __init__(self, gtfs_dir: Path):
         self.gtfs_dir = gtfs_dir
@@ -94,21 +87,21 @@ class GtfsIndex:
         # Build UIC -> stop_id map using stop_code first
         # ------------------------------------------------------------
         uic_map: Dict[str, List[str]] = {}
+        stop_ids = self.stops["stop_id"].astype(str)
 
-        # 1) stop_code 
+        # 1) stop_code (8-digit codes selected column-wise, no per-row regex)
         if "stop_code" in self.stops.columns:
-            for _, r in self.stops.iterrows():
-                stop_id = str(r["stop_id"])
-                stop_code = str(r["stop_code"]).strip()
-                if re.fullmatch(r"\d{8}", stop_code):
-                    uic_map.setdefault(stop_code, []).append(stop_id)
+            codes = self.stops["stop_code"].astype(str).str.strip()
+            ok = codes.str.fullmatch(r"\d{8}")
+            for stop_code, stop_id in zip(codes[ok].tolist(), stop_ids[ok].tolist()):
+                uic_map.setdefault(stop_code, []).append(stop_id)
 
         # 2) fallback: extract from stop_id digits
         if not uic_map:
-            for sid in self.stops["stop_id"].astype(str).tolist():
-                uic = _extract_uic_from_stop_id(sid)
-                if uic:
-                    uic_map.setdefault(uic, []).append(sid)
+            uics = stop_ids.str.extract(r"(\d{8})", expand=False)
+            ok = uics.notna()
+            for uic, sid in zip(uics[ok].tolist(), stop_ids[ok].tolist()):
+                uic_map.setdefault(uic, []).append(sid)
 
         # ensure unique
         for k in list(uic_map.keys()):
@@ -142,7 +135,7 @@ def resolve_stop_ids_for_station(
     q = _norm(station_name)
     if not q:
         return []
-    sub = gtfs.stops[gtfs.stops["stop_name_norm"].str.contains(re.escape(q), na=False)]
+    sub = gtfs.stops[gtfs.stops["stop_name_norm"].str.contains(q, regex=False, na=False)]
     if sub.empty:
         return []
     return sub["stop_id"].astype(str).head(max_results).tolist()
@@ -177,28 +170,28 @@ def find_direct_journeys(
 
     merged = merged.sort_values("departure_time").head(200)
 
+    # only the first `limit` rows become journeys: read them column-wise (no per-row Series)
+    top = merged.head(limit)
     out: List[DirectJourney] = []
-    for _, r in merged.iterrows():
-        trip_id = str(r["trip_id"])
-        route_id = gtfs.route_by_trip.get(trip_id, "")
-
-        from_sid = str(r["stop_id_from"])
-        to_sid = str(r["stop_id_to"])
-
+    for trip_id, from_sid, to_sid, dep_time, arr_time in zip(
+        top["trip_id"].astype(str),
+        top["stop_id_from"].astype(str),
+        top["stop_id_to"].astype(str),
+        top["departure_time"].astype(str),
+        top["arrival_time"].astype(str),
+    ):
         out.append(
             DirectJourney(
                 from_stop_id=from_sid,
                 to_stop_id=to_sid,
                 trip_id=trip_id,
-                route_id=route_id,
-                departure_time=str(r["departure_time"]),
-                arrival_time=str(r["arrival_time"]),
+                route_id=gtfs.route_by_trip.get(trip_id, ""),
+                departure_time=dep_time,
+                arrival_time=arr_time,
                 from_stop_name=gtfs.stop_name_by_id.get(from_sid, from_sid),
                 to_stop_name=gtfs.stop_name_by_id.get(to_sid, to_sid),
             )
         )
-        if len(out) >= limit:
-            break
 
     return out
 
@@ -276,33 +269,33 @@ def find_one_transfer_journeys(
 
     joined = joined.sort_values(["dep1_time", "arr2_time"]).head(200)
 
+    # only the first `limit` rows become journeys: read them column-wise (no per-row Series)
+    top = joined.head(limit)
+    cols = [
+        "trip_id_1", "from_stop_id", "transfer_stop_id", "dep1_time", "arr1_time",
+        "trip_id_2", "to_stop_id", "dep2_time", "arr2_time",
+    ]
     out: List[OneTransferJourney] = []
-    for _, r in joined.iterrows():
-        trip1 = str(r["trip_id_1"])
-        trip2 = str(r["trip_id_2"])
-        from_sid = str(r["from_stop_id"])
-        transfer_sid = str(r["transfer_stop_id"])
-        to_sid = str(r["to_stop_id"])
-
+    for trip1, from_sid, transfer_sid, dep1, arr1, trip2, to_sid, dep2, arr2 in zip(
+        *(top[c].astype(str) for c in cols)
+    ):
         out.append(
             OneTransferJourney(
                 trip1_id=trip1,
                 route1_id=gtfs.route_by_trip.get(trip1, ""),
                 from_stop_id=from_sid,
                 transfer_stop_id=transfer_sid,
-                dep1_time=str(r["dep1_time"]),
-                arr1_time=str(r["arr1_time"]),
+                dep1_time=dep1,
+                arr1_time=arr1,
                 trip2_id=trip2,
                 route2_id=gtfs.route_by_trip.get(trip2, ""),
                 to_stop_id=to_sid,
-                dep2_time=str(r["dep2_time"]),
-                arr2_time=str(r["arr2_time"]),
+                dep2_time=dep2,
+                arr2_time=arr2,
                 from_stop_name=gtfs.stop_name_by_id.get(from_sid, from_sid),
                 transfer_stop_name=gtfs.stop_name_by_id.get(transfer_sid, transfer_sid),
                 to_stop_name=gtfs.stop_name_by_id.get(to_sid, to_sid),
             )
         )
-        if len(out) >= limit:
-            break
 
     return out
@@ -1,17 +1,35 @@
 from __future__ import annotations
 
 import re
+import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Tuple, List
+from typing import Dict, Iterable, Optional, Tuple, List
 
 from unidecode import unidecode
 from rapidfuzz import process, fuzz
 
+try:
+    import ahocorasick
+except ImportError:  # optional: plain substring loop below
+    ahocorasick = None
+
 
 # -----------------------------
 # Normalization + city loading
 # -----------------------------
 
+# French accents/ligatures -> unidecode's ASCII output, applied in one C-level pass
+_ACCENT_TABLE = str.maketrans({
+    **{c: unidecode(c) for c in "àâäçéèêëîïôöùûüÿœæÀÂÄÇÉÈÊËÎÏÔÖÙÛÜŸŒÆ"},
+    "’": "'",
+})
+
+_NON_WORD_RE = re.compile(r"[^a-z0-9\s\-']")
+_SPACES_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=65536)
 def _norm(s: str) -> str:
     """
     Normalize a string for robust matching:
@@ -21,10 +39,12 @@ def _norm(s: str) -> str:
     - keep letters/numbers/spaces/hyphens/apostrophes
     - collapse whitespace
     """
-    s = unidecode(s).lower()
-    s = s.replace("’", "'")
-    s = re.sub(r"[^a-z0-9\s\-']", " ", s)
-    s = re.sub(r"\s+", " ", s).strip()
+    s = s.translate(_ACCENT_TABLE)
+    if not s.isascii():
+        s = unidecode(s)
+    s = s.lower()
+    s = _NON_WORD_RE.sub(" ", s)
+    s = _SPACES_RE.sub(" ", s).strip()
     return s
 
 
@@ -39,8 +59,38 @@ def _load_cities() -> List[str]:
     return [line.strip() for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
 
 
-CITIES = _load_cities()
-CITIES_NORM = {_norm(c): c for c in CITIES}  # normalized -> canonical
+# read-only after import: tuple + interned strings (identity-fast dict/set lookups)
+CITIES = tuple(sys.intern(c) for c in _load_cities())
+CITIES_NORM = {sys.intern(_norm(c)): c for c in CITIES}  # normalized -> canonical
+
+
+def _build_city_automaton():
+    """
+    Aho-Corasick automaton over normalized city names (one scan finds every
+    contained city). None when pyahocorasick is not installed.
+    """
+    if ahocorasick is None or not CITIES_NORM:
+        return None
+    automaton = ahocorasick.Automaton()
+    for city_norm in CITIES_NORM:
+        if city_norm:
+            automaton.add_word(city_norm, city_norm)
+    automaton.make_automaton()
+    return automaton
+
+
+_CITY_AUTOMATON = _build_city_automaton()
+_CITY_CHOICES = list(CITIES_NORM)  # fuzzy-match choices, built once
+
+
+def _contained_cities(frag_n: str) -> List[str]:
+    """
+    Canonical names of all cities whose normalized name occurs in frag_n.
+    """
+    if _CITY_AUTOMATON is not None:
+        found = {city_norm for _end, city_norm in _CITY_AUTOMATON.iter(frag_n)}
+        return [CITIES_NORM[c] for c in found]
+    return [city_can for city_norm, city_can in CITIES_NORM.items() if city_norm and city_norm in frag_n]
 
 
 # -----------------------------
@@ -63,10 +113,7 @@ def _best_city_match(fragment: str, score_cutoff: int = 85) -> Optional[str]:
         return None
 
     # Containment check (also detects ambiguity)
-    contained = []
-    for city_norm, city_can in CITIES_NORM.items():
-        if city_norm and city_norm in frag_n:
-            contained.append(city_can)
+    contained = _contained_cities(frag_n)
 
     if len(contained) > 1:
         return None
@@ -74,10 +121,9 @@ def _best_city_match(fragment: str, score_cutoff: int = 85) -> Optional[str]:
         return contained[0]
 
     # Fuzzy match against normalized city names
-    choices = list(CITIES_NORM.keys())
     match = process.extractOne(
         frag_n,
-        choices,
+        _CITY_CHOICES,
         scorer=fuzz.WRatio,
         score_cutoff=score_cutoff,
     )
@@ -117,12 +163,20 @@ _PATTERNS = [
 ]
 
 # Step 3: travel keyword filter to quickly reject trash texts
-TRAVEL_KEYWORDS = {
+TRAVEL_KEYWORDS = frozenset({
     "aller", "vais", "va", "allons", "allez",
     "rendre", "trajet", "voyage",
     "train", "bus", "avion",
     "de", "depuis", "vers", "a", "à",
-}
+})
+# one scan for "any keyword occurs in the sentence" (same test as checking each keyword)
+_TRAVEL_KEYWORDS_RE = re.compile("|".join(map(re.escape, sorted(TRAVEL_KEYWORDS))))
+
+
+_SLOT_STOP_RE = re.compile(
+    r"\b(?:aujourd|demain|ce\s+soir|svp|s'il\s+te\s+plait|s'il\s+vous\s+plait|merci)\b",
+    re.IGNORECASE,
+)
 
 
 def _clean_slot(text: str) -> str:
@@ -130,16 +184,18 @@ def _clean_slot(text: str) -> str:
     Cleanup a captured group (departure/destination chunk).
     Removes trailing punctuation and common polite/time words.
     """
-    text = re.split(
-        r"\b(?:aujourd|demain|ce\s+soir|svp|s'il\s+te\s+plait|s'il\s+vous\s+plait|merci)\b",
-        text,
-        maxsplit=1,
-        flags=re.IGNORECASE,
-    )[0]
+    text = _SLOT_STOP_RE.split(text, maxsplit=1)[0]
     text = text.strip(" ,;:.!?")
     return text.strip()
 
 
+def _slot_city(raw: str) -> Optional[str]:
+    """
+    Canonical city for a captured departure/destination chunk (same steps for both roles).
+    """
+    return _best_city_match(_clean_slot(raw))
+
+
 # -----------------------------
 # Main function used by CLI
 # -----------------------------
@@ -155,7 +211,7 @@ def parse_order(sentence: str) -> Optional[Tuple[str, str]]:
 
     # Step 3: Quick reject for non-travel sentences (trash text)
     s_norm = _norm(s)
-    if not any(k in s_norm.split() or k in s_norm for k in TRAVEL_KEYWORDS):
+    if not _TRAVEL_KEYWORDS_RE.search(s_norm):
         return None
 
     # Try pattern-based extraction
@@ -164,14 +220,12 @@ def parse_order(sentence: str) -> Optional[Tuple[str, str]]:
         if not m:
             continue
 
-        dep_raw = _clean_slot(m.group("dep"))
-        dest_raw = _clean_slot(m.group("dest"))
-
-        dep = _best_city_match(dep_raw)
-        dest = _best_city_match(dest_raw)
-
-        # Reject incomplete
-        if not dep or not dest:
+        # Reject incomplete (destination is not looked up when departure already failed)
+        dep = _slot_city(m.group("dep"))
+        if not dep:
+            return None
+        dest = _slot_city(m.group("dest"))
+        if not dest:
             return None
 
         # Reject same-city travel
@@ -182,3 +236,17 @@ def parse_order(sentence: str) -> Optional[Tuple[str, str]]:
 
     # If no pattern matched, it's incomplete/unsupported -> INVALID
     return None
+
+
+def parse_orders(sentences: Iterable[str]) -> List[Optional[Tuple[str, str]]]:
+    """
+    Batch version of parse_order (same results, same order).
+    Identical sentences are parsed only once.
+    """
+    seen: Dict[str, Optional[Tuple[str, str]]] = {}
+    out: List[Optional[Tuple[str, str]]] = []
+    for sentence in sentences:
+        if sentence not in seen:
+            seen[sentence] = parse_order(sentence)
+        out.append(seen[sentence])
+    return out
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Tuple, List
+from typing import Iterable, Optional, Tuple, List
 import re
 
 import spacy
@@ -65,14 +65,38 @@ def _get_nlp() -> Language:
     return _NLP
 
 
+def _order_from_doc(doc) -> Optional[Tuple[str, str]]:
+    """
+    Departure/arrival pair from an already processed Doc.
+    """
+    # first two distinct CITY entities, in text order (only those are used below)
+    cities: List[str] = []
+    seen = set()
+    for ent in doc.ents:
+        if ent.label_ != "CITY":
+            continue
+        key = ent.text.lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        cities.append(ent.text)
+        if len(cities) == 2:
+            break
+
+    if len(cities) < 2:
+        return None
+
+    # "de X à Y" / "depuis X vers Y" and every other phrasing keep the text order
+    # of the first two cities as dep -> arr, so no cue needs to be checked.
+    return (cities[0], cities[1])
+
+
 def parse_order_spacy(sentence: str) -> Optional[Tuple[str, str]]:
     """
     NER-based resolver (simple + explainable):
     - Extract CITY entities with spaCy EntityRuler
-    - Determine departure/arrival order using common French travel cues:
-        * "de X à Y"
-        * "depuis X vers Y"
-        * "aller à Y" (incomplete -> None)
+    - Departure/arrival follow text order ("de X à Y", "depuis X vers Y")
+    - Fewer than two cities, e.g. "aller à Y" (incomplete -> None)
     Returns (departure_city, arrival_city) or None.
     """
     s = (sentence or "").strip()
@@ -80,26 +104,17 @@ def parse_order_spacy(sentence: str) -> Optional[Tuple[str, str]]:
         return None
 
     nlp = _get_nlp()
-    doc = nlp(s)
-
-    cities = [ent.text for ent in doc.ents if ent.label_ == "CITY"]
-    seen = set()
-    cities = [c for c in cities if not (c.lower() in seen or seen.add(c.lower()))]
-
-    if len(cities) < 2:
-        return None
+    return _order_from_doc(nlp(s))
 
-    sent_norm = _normalize(s)
 
-    # Try explicit "de X à Y" / "de X a Y"
-    c1 = _normalize(cities[0])
-    c2 = _normalize(cities[1])
-
-    # Pattern: "de <city1> à <city2>" or "depuis <city1> vers <city2>"
-    if f"de {c1} a {c2}" in sent_norm or f"de {c1} à {c2}" in sent_norm:
-        return (cities[0], cities[1])
-    if f"depuis {c1} vers {c2}" in sent_norm or f"depuis {c1} a {c2}" in sent_norm or f"depuis {c1} à {c2}" in sent_norm:
-        return (cities[0], cities[1])
+def parse_orders_spacy(sentences: Iterable[str], batch_size: int = 64) -> List[Optional[Tuple[str, str]]]:
+    """
+    Batch version of parse_order_spacy (same results, same order).
+    Non-empty sentences go through nlp.pipe in batches instead of one nlp() call each.
+    """
+    stripped = [(s or "").strip() for s in sentences]
+    texts = [s for s in stripped if s]
 
-    # Fallback: assume order of first two extracted cities = dep -> arr
-    return (cities[0], cities[1])
+    nlp = _get_nlp()
+    docs = iter(nlp.pipe(texts, batch_size=batch_size))
+    return [_order_from_doc(next(docs)) if s else None for s in stripped]
@@ -0,0 +1,38 @@
+import pytest
+
+from api.resolver_service import resolve_sentence
+
+
+def _names(stations):
+    return [st.station_name for st in stations]
+
+
+def test_fuzzy_departure_does_not_add_ambiguity_penalty():
+    # "Saint-Etienne" has no whole-word match ("Saint-Étienne ..."): its stations come from the fuzzy fallback
+    r = resolve_sentence("Aller de Saint-Etienne à Lyon s'il vous plaît")
+
+    assert r.ok
+    assert (r.departure, r.arrival) == ("Saint-Etienne", "Lyon")
+    assert _names(r.departure_candidates) == [
+        "Saint-Étienne Bellevue",
+        "Saint-Étienne Carnot",
+        "Saint-Étienne Châteaucreux",
+        "Saint-Étienne La Terrasse",
+        "Saint-Étienne Le Clapier",
+    ]
+    assert r.debug["departure_fuzzy_candidates_count"] == 5
+    # only Lyon's 8 whole-word candidates count: 0.93 - 0.10
+    assert r.debug["ambiguity_penalty"] == pytest.approx(0.10)
+    assert r.confidence == pytest.approx(0.83)
+
+
+def test_fuzzy_departure_without_accent():
+    r = resolve_sentence("Je souhaite me rendre à Nice depuis Nimes")
+
+    assert r.ok
+    assert (r.departure, r.arrival) == ("Nimes", "Nice")
+    assert _names(r.departure_candidates) == ["Nîmes", "Nîmes Pont du Gard"]
+    assert r.debug["departure_fuzzy_candidates_count"] == 2
+    # Nice's 4 whole-word candidates: 0.93 - 0.02
+    assert r.debug["ambiguity_penalty"] == pytest.approx(0.02)
+    assert r.confidence == pytest.approx(0.91)
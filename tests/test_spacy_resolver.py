@@ -0,0 +1,31 @@
+import csv
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("spacy")
+
+from api.resolver_service import resolve_sentence, resolve_sentences
+from tor.spacy_resolver import parse_order_spacy, parse_orders_spacy
+
+EVAL_CSV = Path(__file__).resolve().parents[1] / "data" / "synthetic_eval.csv"
+
+
+def _eval_sentences():
+    with open(EVAL_CSV, encoding="utf-8") as f:
+        return [row["sentence"] for row in csv.DictReader(f)]
+
+
+def test_parse_orders_spacy_matches_parse_order_spacy():
+    # empty / blank entries are skipped by nlp.pipe but keep their slot in the output
+    sentences = ["", "   ", None] + _eval_sentences() + ["Aller de Paris à Lyon", ""]
+
+    assert parse_orders_spacy(sentences, batch_size=7) == [parse_order_spacy(s) for s in sentences]
+
+
+def test_resolve_sentences_spacy_matches_resolve_sentence():
+    sentences = _eval_sentences()[:120] + ["", "Je veux aller de Nimes à Lille"]
+
+    batch = resolve_sentences(sentences, mode="spacy", helpful=True)
+
+    assert batch == [resolve_sentence(s, mode="spacy", helpful=True) for s in sentences]